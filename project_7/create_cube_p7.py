@@ -21,7 +21,7 @@ OUTPUT TABLE
     Category
     City
     Year
-    Sales Amount
+    Sales Amount (same as Sales Amount Sum)
     Sales Amount Sum
     Sales Amount Mean
     Sales Amount Count
@@ -29,15 +29,18 @@ OUTPUT TABLE
     Time Since Joined
 """
 
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 import pathlib
 
+import pandas as pd
+
 from analytics_project.utils_logger import logger
 
 # Constants
 PROJECT_7_FOLDER = pathlib.Path(__file__).resolve().parent  # project_7 folder
 SMARTSTORE2_FOLDER = PROJECT_7_FOLDER.parent  # smartstore2 folder
-DATA_FOLDER = PROJECT_7_FOLDER / "data_p7"  # folder containing csvs
+DATA_FOLDER = PROJECT_7_FOLDER / "data_p7"  # folder containing the prepared files
+NANOSECONDS_PER_DAY = 86_400_000_000_000
 
 # Output directories
 DATA_DIR = PROJECT_7_FOLDER / "data_p7"
@@ -46,63 +49,106 @@ PREPARED_DATA_DIR = DATA_DIR  # OUTPUT directly to data_p7
 # Ensure the directories exist or create them
 DATA_DIR.mkdir(exist_ok=True)
 
-# Read your CSVs
-sales = pd.read_csv(
-    DATA_FOLDER / 'sales_cube_prep.csv',
-    usecols=["product_id", "customer_id", "sales_id", "sales_amount", "city"],
-)
-customers = pd.read_csv(
-    DATA_FOLDER / 'customer_cube_prep.csv', usecols=["customer_id", "join_date"]
-)
-products = pd.read_csv(DATA_FOLDER / 'products_cube_prep.csv', usecols=["category", "product_id"])
-logger.info("csvs Read")
-
-# Merge them together
-cube_df = sales.merge(customers, on='customer_id').merge(products, on='product_id')
-logger.info("Cube Created")
-
-# Convert join_date to datetime (do this once, before all date operations)
-cube_df['join_date'] = pd.to_datetime(cube_df['join_date'])
-
-# Calculate time since join date
-today = pd.Timestamp.now()
-cube_df['days_since_join'] = (today - cube_df['join_date']).dt.days
-
-
-# Calculate years and months since join
-def calculate_time_elapsed(join_date):
-    delta = today - join_date
-    years = delta.days // 365
-    remaining_days = delta.days % 365
+#####################################
+# Define Main Function - The main entry point of the script
+#####################################
+
+
+def main() -> None:
+    """
+    Main function for building the project 7 cube.
+    """
+    # Read the prepared Parquet files (only the columns the cube needs are loaded)
+    # The three reads are independent, so they run in parallel threads
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        sales_future = executor.submit(
+            pd.read_parquet,
+            DATA_FOLDER / 'sales_cube_prep.parquet',
+            columns=["product_id", "customer_id", "sales_id", "sales_amount", "city"],
+        )
+        customers_future = executor.submit(
+            pd.read_parquet,
+            DATA_FOLDER / 'customer_cube_prep.parquet',
+            columns=["customer_id", "join_date"],
+        )
+        products_future = executor.submit(
+            pd.read_parquet,
+            DATA_FOLDER / 'products_cube_prep.parquet',
+            columns=["category", "product_id"],
+        )
+    sales = sales_future.result()
+    customers = customers_future.result()
+    products = products_future.result()
+    logger.info("Prepared data read")
+
+    # Join them together
+    # Each sale has exactly one customer and one product, so a keyed lookup replaces the merges
+    # (map raises if either lookup has duplicate keys, like validate='many_to_one' did)
+    join_dates = customers.set_index('customer_id')['join_date']
+    categories = products.set_index('product_id')['category']
+    sales['join_date'] = sales['customer_id'].map(join_dates)
+    sales['category'] = sales['product_id'].map(categories)
+    # Keep inner-join behavior: drop sales whose customer or product was not found
+    cube_df = sales.dropna(subset=['join_date', 'category'])
+    logger.info("Cube Created")
+
+    # Low-cardinality text keys group much faster as categoricals (integer codes instead of strings)
+    cube_df['category'] = cube_df['category'].astype('category')
+    cube_df['city'] = cube_df['city'].astype('category')
+
+    # Convert join_date to datetime (do this once, before all date operations)
+    cube_df['join_date'] = pd.to_datetime(cube_df['join_date'])
+
+    # Calculate time since join date
+    # Work on the raw int64 nanoseconds so no intermediate timedelta column is built
+    today = pd.Timestamp.now()
+    join_ns = cube_df['join_date'].to_numpy(dtype='datetime64[ns]').view('i8')
+    days_since_join = pd.Series((today.value - join_ns) // NANOSECONDS_PER_DAY, index=cube_df.index)
+    cube_df['days_since_join'] = days_since_join.where(cube_df['join_date'].notna())
+
+    # Calculate years and months since join for every row at once (no per-row apply)
+    years, remaining_days = divmod(cube_df['days_since_join'], 365)
     months = remaining_days // 30
-    return f"{years} year(s) and {months} month(s)"
-
+    cube_df['time_since_join'] = (
+        years.astype(str) + ' year(s) and ' + months.astype(str) + ' month(s)'
+    )
 
-cube_df['time_since_join'] = cube_df['join_date'].apply(calculate_time_elapsed)
+    # Add year column
+    cube_df["year"] = cube_df["join_date"].dt.year
+    logger.info("Created time_since_join and year columns")
+
+    # Create aggregated cube
+    # sales_amount is the measure, so it is aggregated rather than used as a group key
+    # Include the new columns in your aggregation
+    cube = (
+        cube_df.groupby(['category', 'city', 'year'], observed=True, sort=False)
+        .agg(
+            # Named aggregation gives flat column names directly (no MultiIndex to flatten)
+            sales_amount_sum=('sales_amount', 'sum'),
+            sales_amount_mean=('sales_amount', 'mean'),
+            sales_amount_count=('sales_amount', 'count'),
+            # Take the first value in each group
+            days_since_join_first=('days_since_join', 'first'),
+            time_since_join_first=('time_since_join', 'first'),
+        )
+        .reset_index()
+    )
+    # P7_visuals.pbix binds p7_cube.sales_amount, so the column stays (now the group total)
+    cube.insert(3, 'sales_amount', cube['sales_amount_sum'])
+    logger.info("Cube Aggregated")
 
-# Add year column
-cube_df["year"] = cube_df["join_date"].dt.year
-logger.info("Created time_since_join and year columns")
+    # Save the cube to the data directory
+    # Stays CSV because Power BI loads it; write in batches with a fixed line ending
+    output_path = DATA_DIR / 'p7_cube.csv'
+    cube.to_csv(output_path, index=False, chunksize=100_000, lineterminator='\n')
+    logger.info(f"Cube saved to: {output_path}")
 
-# Create aggregated cube
-# Include the new columns in your aggregation
-cube = (
-    cube_df.groupby(['category', 'city', 'year', "sales_amount"])
-    .agg(
-        {
-            'sales_amount': ['sum', 'mean', 'count'],
-            'days_since_join': 'first',  # Take first value since it's same per customer
-            'time_since_join': 'first',  # Take first value since it's same per customer
-        }
-    )
-    .reset_index()
-)
-logger.info("Cube Aggregated")
 
-# Flatten column names after aggregation
-cube.columns = ['_'.join(col).strip('_') if col[1] else col[0] for col in cube.columns.values]
+#####################################
+# Conditional Execution Block
+# Ensures the script runs only when executed directly
+# This is a common Python convention.
+#####################################
 
-# Save the cube to the data directory
-output_path = DATA_DIR / 'p7_cube.csv'
-cube.to_csv(output_path, index=False)
-logger.info(f"Cube saved to: {output_path}")
+if __name__ == "__main__":
+    main()
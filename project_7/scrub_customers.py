@@ -20,6 +20,7 @@ import pathlib
 import sys
 
 # Import from external packages (requires a virtual environment)
+import numpy as np
 import pandas as pd
 
 # Ensure project root is in sys.path for local imports (now 3 parents are needed)
@@ -28,10 +29,6 @@ sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent.parent))
 # Import local modules (e.g. utils/logger.py)
 from analytics_project.utils_logger import logger
 
-# Optional: Use a data_scrubber module for common data cleaning tasks
-from analytics_project.utils_scrubber import DataScrubber
-
-
 # Constants
 PROJECT_7_FOLDER: pathlib.Path = pathlib.Path(__file__).resolve().parent  # project_7 folder
 SMARTSTORE2_FOLDER: pathlib.Path = PROJECT_7_FOLDER.parent  # smartstore2 folder
@@ -45,6 +42,14 @@ PREPARED_DATA_DIR: pathlib.Path = DATA_DIR  # OUTPUT directly to data_p7
 # Ensure the directories exist or create them
 DATA_DIR.mkdir(exist_ok=True)
 
+# Column types for the input file, so the reader does not have to infer them
+CUSTOMER_DTYPES: dict[str, str] = {
+    "customer_id": "Int32",
+    "number_of_purchases": "Int32",
+    "region": "category",
+    "contact_preferences": "category",
+}
+
 
 #####################################
 # Define Functions - Reusable blocks of code / instructions
@@ -56,7 +61,7 @@ def read_raw_data(file_name: str) -> pd.DataFrame:
     file_path: pathlib.Path = RAW_DATA_DIR.joinpath(file_name)
     try:
         logger.info(f"READING: {file_path}.")
-        return pd.read_csv(file_path)
+        return pd.read_csv(file_path, engine='pyarrow', dtype=CUSTOMER_DTYPES)
     except FileNotFoundError:
         logger.error(f"File not found: {file_path}")
         return pd.DataFrame()  # Return an empty DataFrame if the file is not found
@@ -67,7 +72,9 @@ def read_raw_data(file_name: str) -> pd.DataFrame:
 
 def save_prepared_data(df: pd.DataFrame, file_name: str) -> None:
     """
-    Save cleaned data to CSV.
+    Save cleaned data to Parquet.
+
+    Parquet keeps the column dtypes, so create_cube_p7.py does not have to re-parse text.
 
     Args:
         df (pd.DataFrame): Cleaned DataFrame.
@@ -77,21 +84,14 @@ def save_prepared_data(df: pd.DataFrame, file_name: str) -> None:
         f"FUNCTION START: save_prepared_data with file_name={file_name}, dataframe shape={df.shape}"
     )
     file_path = PREPARED_DATA_DIR.joinpath(file_name)
-    df.to_csv(file_path, index=False)
+    df.to_parquet(file_path, compression="zstd", index=False)
     logger.info(f"Data saved to {file_path}")
 
 
 def column_data_type(df: pd.DataFrame) -> pd.DataFrame:
     logger.info("Function Start: Changing Data Type")
 
-    scrubber = DataScrubber(df)
-
-    df = scrubber.convert_column_to_new_data_type('customer_id', int)
-    logger.info(f"Converted column 'customer_id' to dtype: {df['customer_id'].dtype}")
-
-    df = scrubber.convert_column_to_new_data_type("number_of_purchases", int)
-    logger.info(f"Converted column 'customer_id' to dtype: {df["number_of_purchases"].dtype}")
-
+    # customer_id and number_of_purchases are already integers (see CUSTOMER_DTYPES)
     df['join_date'] = pd.to_datetime(df['join_date'], errors='coerce')
     logger.info(f"Converted column 'join_date' to dtype: {df['join_date'].dtype}")
     return df
@@ -111,14 +111,10 @@ def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     """
     logger.info(f"FUNCTION START: remove_duplicates with dataframe shape={df.shape}")
 
-    # Let's delegate this to the DataScrubber class
-    # First, create an instance of the DataScrubber class
-    # by passing in the dataframe as an argument.
-    df_scrubber = DataScrubber(df)
-
-    # Now, call the method on our instance to remove duplicates.
-    # This method will return a new dataframe with duplicates removed.
-    df_deduped = df_scrubber.remove_duplicate_records(subset=["customer_id"], keep="first")
+    # The key is an integer column, so np.unique finds the first row for each id
+    # without pandas hashing every row
+    _, first_rows = np.unique(df["customer_id"].to_numpy(), return_index=True)
+    df_deduped = df.iloc[np.sort(first_rows)]
 
     logger.info(f"Original dataframe shape: {df.shape}")
     logger.info(f"Deduped  dataframe shape: {df_deduped.shape}")
@@ -139,7 +135,7 @@ def main() -> None:
     logger.info("==================================")
 
     input_file = "customers_prepared.csv"
-    output_file = "customer_cube_prep.csv"
+    output_file = "customer_cube_prep.parquet"
 
     # Read raw data
     df = read_raw_data(input_file)
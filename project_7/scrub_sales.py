@@ -21,6 +21,7 @@ import pathlib
 import sys
 
 # Import from external packages (requires a virtual environment)
+import numpy as np
 import pandas as pd
 
 # Ensure project root is in sys.path for local imports (now 3 parents are needed)
@@ -29,10 +30,6 @@ sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent.parent))
 # Import local modules (e.g. utils/logger.py)
 from analytics_project.utils_logger import logger
 
-# Optional: Use a data_scrubber module for common data cleaning tasks
-from analytics_project.utils_scrubber import DataScrubber
-
-
 # Constants
 PROJECT_7_FOLDER: pathlib.Path = pathlib.Path(__file__).resolve().parent  # project_7 folder
 REPO_ROOT: pathlib.Path = PROJECT_7_FOLDER.parent  # smart-store2-kehummel folder
@@ -46,6 +43,16 @@ PREPARED_DATA_DIR: pathlib.Path = DATA_DIR  # OUTPUT directly to data_p7
 # Ensure the directories exist or create them
 DATA_DIR.mkdir(exist_ok=True)
 
+# Column types for the input file, so the reader does not have to infer them
+# The ids are small, so 32-bit nullable integers are plenty
+SALES_DTYPES: dict[str, str] = {
+    "sales_id": "Int32",
+    "customer_id": "Int32",
+    "product_id": "Int32",
+    "sales_amount": "float64",
+    "city": "category",
+}
+
 #####################################
 # Define Functions - Reusable blocks of code / instructions
 #####################################
@@ -64,7 +71,7 @@ def read_raw_data(file_name: str) -> pd.DataFrame:
     logger.info(f"FUNCTION START: read_raw_data with file_name={file_name}")
     file_path = RAW_DATA_DIR.joinpath(file_name)
     logger.info(f"Reading data from {file_path}")
-    df = pd.read_csv(file_path)
+    df = pd.read_csv(file_path, engine='pyarrow', dtype=SALES_DTYPES)
     logger.info(f"Loaded dataframe with {len(df)} rows and {len(df.columns)} columns")
 
     logger.info(f"Column datatypes: \n{df.dtypes}")
@@ -75,7 +82,9 @@ def read_raw_data(file_name: str) -> pd.DataFrame:
 
 def save_prepared_data(df: pd.DataFrame, file_name: str) -> None:
     """
-    Save cleaned data to CSV.
+    Save cleaned data to Parquet.
+
+    Parquet keeps the column dtypes, so create_cube_p7.py does not have to re-parse text.
 
     Args:
         df (pd.DataFrame): Cleaned DataFrame.
@@ -85,7 +94,7 @@ def save_prepared_data(df: pd.DataFrame, file_name: str) -> None:
         f"FUNCTION START: save_prepared_data with file_name={file_name}, dataframe shape={df.shape}"
     )
     file_path = PREPARED_DATA_DIR.joinpath(file_name)
-    df.to_csv(file_path, index=False)
+    df.to_parquet(file_path, compression="zstd", index=False)
     logger.info(f"Data saved to {file_path}")
 
 
@@ -101,14 +110,10 @@ def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     """
     logger.info(f"FUNCTION START: remove_duplicates with dataframe shape={df.shape}")
 
-    # Let's delegate this to the DataScrubber class
-    # First, create an instance of the DataScrubber class
-    # by passing in the dataframe as an argument.
-    df_scrubber = DataScrubber(df)
-
-    # Now, call the method on our instance to remove duplicates.
-    # This method will return a new dataframe with duplicates removed.
-    df_deduped = df_scrubber.remove_duplicate_records(subset=["sales_id"], keep="first")
+    # The key is an integer column, so np.unique finds the first row for each id
+    # without pandas hashing every row
+    _, first_rows = np.unique(df["sales_id"].to_numpy(), return_index=True)
+    df_deduped = df.iloc[np.sort(first_rows)]
 
     logger.info(f"Original dataframe shape: {df.shape}")
     logger.info(f"Deduped  dataframe shape: {df_deduped.shape}")
@@ -131,19 +136,8 @@ def standardize_formats(df: pd.DataFrame) -> pd.DataFrame:
     logger.info(f"Columns in standardize_formats: {df.columns.tolist()}")
     print(f"DEBUG - Columns: {df.columns.tolist()}")  # Also print to console
 
-    # Convert to numeric before rounding
-    df["sales_amount"] = pd.to_numeric(df["sales_amount"], errors='coerce')
     df["sales_amount"] = df["sales_amount"].round(2)  # Round prices to 2 decimal places
 
-    # Convert product ID to an int
-    df["product_id"] = df["product_id"].astype('Int64')
-
-    # Convert Sales ID to an int
-    df["sales_id"] = df["sales_id"].astype('Int64')
-
-    # Convert customer ID to int
-    df["customer_id"] = df["customer_id"].astype('Int64')
-
     logger.info("Completed standardizing formats")
     return df
 
@@ -162,10 +156,7 @@ def remove_outliers(df: pd.DataFrame) -> pd.DataFrame:
     logger.info(f"FUNCTION START: remove_outliers with dataframe shape={df.shape}")
     initial_count = len(df)
 
-    # Convert to numeric (in case it's stored as strings)
-    df["sales_amount"] = pd.to_numeric(df["sales_amount"], errors='coerce')
-
-    # Now filter
+    # sales_amount is already numeric (converted once in main)
     df = df[(df["sales_amount"] > 1)]
 
     removed_count = initial_count - len(df)
@@ -188,13 +179,16 @@ def main() -> None:
     logger.info("==================================")
 
     input_file = "sales_prepared.csv"
-    output_file = "sales_cube_prep.csv"
+    output_file = "sales_cube_prep.parquet"
 
     # Read raw data
     df = read_raw_data(input_file)
 
     # Clean column names (strip whitespace) FIRST
-    df.columns = df.columns.str.strip()  # ← Make sure this runs!
+    df.columns = [column.strip() for column in df.columns]  # ← Make sure this runs!
+
+    # Convert sales_amount to numeric once (in case it's stored as strings)
+    df["sales_amount"] = pd.to_numeric(df["sales_amount"], errors='coerce')
 
     # Record original shape
     original_shape = df.shape
@@ -203,14 +197,14 @@ def main() -> None:
     logger.info(f"Initial dataframe columns: {', '.join(df.columns.tolist())}")
     logger.info(f"Initial dataframe shape: {df.shape}")
 
-    # Standardize formats of columns
-    df = standardize_formats(df)
+    # Remove outliers first so the later steps work on fewer rows
+    df = remove_outliers(df)
 
     # Remove duplicates
     df = remove_duplicates(df)
 
-    # Remove outliers
-    df = remove_outliers(df)
+    # Standardize formats of columns
+    df = standardize_formats(df)
 
     # Save prepared data
     save_prepared_data(df, output_file)
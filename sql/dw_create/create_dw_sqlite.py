@@ -150,6 +150,9 @@ def populate_dw() -> None:
             }
         )
 
+        # Money is stored as whole cents (see create_products.sql)
+        df_products["unit_price"] = (df_products["unit_price"] * 100).round().astype("int64")
+
         df_products.to_sql("products", conn, if_exists="replace", index=False)
         logger.info(f"Inserted {len(df_products)} rows into products table.")
 
@@ -184,6 +187,10 @@ def populate_dw() -> None:
         ]
         df_sales = df_sales[[col for col in expected_columns if col in df_sales.columns]]
 
+        # Money is stored as whole cents (see create_sales.sql)
+        if "sales_amount" in df_sales.columns:
+            df_sales["sales_amount"] = (df_sales["sales_amount"] * 100).round().astype("int64")
+
         df_sales.to_sql("sales", conn, if_exists="replace", index=False)
         logger.info(f"Inserted {len(df_sales)} rows into sales table.")
 
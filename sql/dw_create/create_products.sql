@@ -4,7 +4,7 @@ CREATE TABLE products (
     product_id TEXT PRIMARY KEY,
     product_name TEXT,
     category TEXT,
-    unit_price REAL,
+    unit_price INTEGER,                    -- whole cents
     stock_quantity INTEGER,
     purchase_type TEXT
 );
\ No newline at end of file
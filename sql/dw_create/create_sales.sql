@@ -7,7 +7,7 @@ CREATE TABLE sales (
     product_id TEXT,                       -- from ProductID
     store_id TEXT,                         -- from StoreID
     campaign_id TEXT,                      -- from CampaignID
-    sales_amount REAL,                     -- from SaleAmount
+    sales_amount INTEGER,                  -- from SaleAmount (whole cents)
     number_of_items INTEGER, 
     city TEXT,
     FOREIGN KEY (customer_id) REFERENCES customers(customer_id),
@@ -5,6 +5,7 @@ File: src/analytics_project/data_prep.py.
 
 # Imports after the opening docstring
 
+from concurrent.futures import ThreadPoolExecutor
 import pathlib
 
 import pandas as pd
@@ -40,7 +41,7 @@ def read_and_log(path: pathlib.Path) -> pd.DataFrame:
     try:
         # Typically, we log the start of a file read operation
         logger.info(f"Reading raw data from {path}.")
-        df = pd.read_csv(path)
+        df = pd.read_csv(path, engine='pyarrow')
         # Typically, we log the successful completion of a file read operation
         logger.info(
             f"{path.name}: loaded DataFrame with shape {df.shape[0]} rows x {df.shape[1]} cols"
@@ -90,9 +91,10 @@ def main() -> None:
     sales_path = RAW_DATA_DIR.joinpath("sales_data.csv")
 
     # Call the function once per file
-    read_and_log(customer_path)
-    read_and_log(product_path)
-    read_and_log(sales_path)
+    # The reads are independent, so they run in parallel threads
+    paths = [customer_path, product_path, sales_path]
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        list(executor.map(read_and_log, paths))
 
     logger.info("Data preparation complete.")
 
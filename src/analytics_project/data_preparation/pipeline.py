@@ -0,0 +1,649 @@
+"""
+analytics_project/data_preparation/pipeline.py
+
+Shared cleaning pipeline for the data preparation scripts.
+
+Each script describes its raw file with a PipelineConfig (schema, fill rules,
+outlier rules and format rules) and calls run_pipeline, so every cleaning step
+is written once and applies to every dataset.
+
+Steps:
+- Read raw data and clean the column names
+- Remove duplicates
+- Handle missing values
+- Remove outliers and invalid rows
+- Ensure consistent formatting
+- Save prepared data (CSV and Parquet)
+
+Engine:
+The heavy lifting already runs in native, multithreaded code: the pyarrow CSV
+reader, NumPy masks and quantiles, and the pyarrow Parquet writer. The steps
+stay on pandas (not polars) so the scripts share one dataframe library with
+the rest of the project and the prepared CSVs keep the text format the DW load
+reads (pyarrow's CSV writer, for example, quotes every string value).
+The Python code here is glue around those calls (one call per column and
+step), so the module is not compiled ahead of time with Cython or mypyc.
+
+"""
+
+#####################################
+# Import Modules at the Top
+#####################################
+
+# Import from Python Standard Library
+from collections.abc import Callable, Iterator, Mapping
+import csv
+from dataclasses import dataclass, field
+import pathlib
+from typing import Any
+
+# Import from external packages (requires a virtual environment)
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+import pyarrow.parquet as pq
+
+# Import local modules (e.g. utils/logger.py)
+from analytics_project.utils_logger import init_logger, logger
+
+# Constants
+SCRIPTS_DATA_PREP_DIR: pathlib.Path = (
+    pathlib.Path(__file__).resolve().parent
+)  # Directory of the data preparation scripts
+SCRIPTS_DIR: pathlib.Path = SCRIPTS_DATA_PREP_DIR.parent  # analytics project
+PROJECT_ROOT: pathlib.Path = SCRIPTS_DIR.parent  # src
+DATA_DIR: pathlib.Path = PROJECT_ROOT / "data"
+RAW_DATA_DIR: pathlib.Path = DATA_DIR / "raw"
+PREPARED_DATA_DIR: pathlib.Path = DATA_DIR / "prepared"  # place to store prepared data
+
+# Prepared files store every date as MM/DD/YYYY
+DATE_OUTPUT_FORMAT: str = "%m/%d/%Y"
+
+# Raw files larger than this are streamed in Arrow record batches instead of loaded whole
+STREAMING_THRESHOLD_BYTES: int = 256 * 1024 * 1024
+STREAMING_BLOCK_SIZE: int = 16 * 1024 * 1024  # bytes of raw CSV per batch
+
+
+#####################################
+# Define the Pipeline Configuration
+#####################################
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Cleaning rules for one raw data file.
+
+    Column names are the raw names for dtypes and rename, and the renamed names everywhere else.
+
+    Attributes:
+        name (str): Script name used in the start/finish log banners.
+        input_file (str): Raw CSV file name in data/raw.
+        output_file (str): Prepared CSV file name in data/prepared.
+        id_column (str): Column identifying a record; duplicates on it are removed.
+        dtypes (Mapping[str, str]): Column types for the reader, so it does not infer them.
+        rename (Mapping[str, str]): Raw column name -> standard column name.
+        numeric_columns (tuple[str, ...]): Text columns coerced to numbers (junk becomes NaN).
+        required_columns (tuple[str, ...]): Rows missing any of these are dropped.
+        fill (Mapping[str, Any]): Column -> constant used for missing values.
+        median_fill_columns (tuple[str, ...]): Columns whose missing values get the median.
+        iqr_columns (tuple[str, ...]): Columns filtered to Q1 - 1.5*IQR .. Q3 + 1.5*IQR.
+        upper_limits (Mapping[str, float]): Column -> limit; rows at or above it are outliers.
+        min_values (Mapping[str, float]): Column -> minimum valid value; rows below it are dropped.
+        date_columns (Mapping[str, tuple[str, ...]]): Column -> accepted input date formats.
+        fill_unparsed_dates (bool): Give dates that match no format the column's fill value.
+        title_columns (tuple[str, ...]): Text columns converted to title case.
+        lower_columns (tuple[str, ...]): Text columns converted to lowercase.
+        round2_columns (tuple[str, ...]): Numeric columns rounded to 2 decimal places.
+        int_columns (Mapping[str, str]): Column -> integer dtype applied after filling.
+    """
+
+    name: str
+    input_file: str
+    output_file: str
+    id_column: str
+    dtypes: Mapping[str, str] = field(default_factory=dict)
+    rename: Mapping[str, str] = field(default_factory=dict)
+    numeric_columns: tuple[str, ...] = ()
+    required_columns: tuple[str, ...] = ()
+    fill: Mapping[str, Any] = field(default_factory=dict)
+    median_fill_columns: tuple[str, ...] = ()
+    iqr_columns: tuple[str, ...] = ()
+    upper_limits: Mapping[str, float] = field(default_factory=dict)
+    min_values: Mapping[str, float] = field(default_factory=dict)
+    date_columns: Mapping[str, tuple[str, ...]] = field(default_factory=dict)
+    fill_unparsed_dates: bool = False
+    title_columns: tuple[str, ...] = ()
+    lower_columns: tuple[str, ...] = ()
+    round2_columns: tuple[str, ...] = ()
+    int_columns: Mapping[str, str] = field(default_factory=dict)
+
+
+#####################################
+# Define Functions - Reusable blocks of code / instructions
+#####################################
+
+
+def read_raw_data(cfg: PipelineConfig) -> pd.DataFrame:
+    """
+    Read raw data from CSV and clean the column names.
+
+    Args:
+        cfg (PipelineConfig): Pipeline configuration.
+
+    Returns:
+        pd.DataFrame: Loaded DataFrame with standard column names.
+    """
+    # Log arguments are passed to loguru instead of f-strings, so the text is only built
+    # when a sink accepts the record
+    logger.info("FUNCTION START: read_raw_data with file_name={}", cfg.input_file)
+    file_path = RAW_DATA_DIR.joinpath(cfg.input_file)
+    logger.info("Reading data from {}", file_path)
+    df = pd.read_csv(file_path, engine="pyarrow", dtype=dict(cfg.dtypes))
+    logger.info("Loaded dataframe with {} rows and {} columns", len(df), len(df.columns))
+
+    # Profiling is debug output: lazy=True skips the full nunique pass unless DEBUG is enabled
+    logger.opt(lazy=True).debug("Column datatypes: \n{}", lambda: df.dtypes)
+    logger.opt(lazy=True).debug("Number of unique values: \n{}", lambda: df.nunique())
+
+    # Strip whitespace from the column names, then switch to the standard names
+    df.columns = [column.strip() for column in df.columns]
+    df = df.rename(columns=dict(cfg.rename))
+    logger.opt(lazy=True).info("Columns: {}", lambda: df.columns.tolist())
+    return df
+
+
+def iter_raw_batches(
+    cfg: PipelineConfig, block_size: int = STREAMING_BLOCK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream raw data from CSV in Arrow record batches.
+
+    Each batch gets the same treatment as read_raw_data (dtypes, clean column names)
+    plus the numeric coercion, so only one batch is held in memory at a time.
+
+    Args:
+        cfg (PipelineConfig): Pipeline configuration.
+        block_size (int): Bytes of raw CSV read per batch.
+
+    Yields:
+        pd.DataFrame: One batch with standard column names.
+    """
+    file_path = RAW_DATA_DIR.joinpath(cfg.input_file)
+    with file_path.open(newline="", encoding="utf-8") as file:
+        header = next(csv.reader(file))
+
+    # Arrow fixes each column type from the first block, so untyped columns are read as text
+    # (a later block with junk like "?" would otherwise fail to convert) and typed afterwards
+    column_types = {
+        column: pa.from_numpy_dtype(np.dtype(pd.api.types.pandas_dtype(cfg.dtypes[column]).type))
+        if cfg.dtypes.get(column, "category") != "category"
+        else pa.string()
+        for column in header
+    }
+    read_options = pa_csv.ReadOptions(block_size=block_size)
+    convert_options = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+
+    with pa_csv.open_csv(
+        file_path, read_options=read_options, convert_options=convert_options
+    ) as reader:
+        for batch in reader:
+            # Arrow gives float for an int column with blanks, so the declared types are reapplied
+            df = batch.to_pandas().astype(dict(cfg.dtypes))
+            categorical = [col for col, dtype in cfg.dtypes.items() if dtype == "category"]
+            # read_raw_data infers the category values (e.g. integer store ids), so numeric
+            # text categories are converted here too
+            for col in categorical:
+                categories = pd.to_numeric(df[col].cat.categories, errors="coerce")
+                if not categories.isna().any():
+                    df[col] = df[col].cat.rename_categories(categories)
+            df.columns = [column.strip() for column in df.columns]
+            df = df.rename(columns=dict(cfg.rename))
+            for col in cfg.numeric_columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+            yield df
+
+
+def save_prepared_data(df: pd.DataFrame, cfg: PipelineConfig) -> None:
+    """
+    Save cleaned data to CSV and Parquet.
+
+    Args:
+        df (pd.DataFrame): Cleaned DataFrame.
+        cfg (PipelineConfig): Pipeline configuration.
+    """
+    logger.info(
+        "FUNCTION START: save_prepared_data with file_name={}, dataframe shape={}",
+        cfg.output_file,
+        df.shape,
+    )
+    file_path = PREPARED_DATA_DIR.joinpath(cfg.output_file)
+    df.to_csv(file_path, index=False)
+    logger.info("Data saved to {}", file_path)
+
+    # Also write a Parquet copy, which later steps can load without re-parsing text
+    parquet_path = file_path.with_suffix(".parquet")
+    pq.write_table(_to_arrow(df), parquet_path, compression="zstd")
+    logger.info("Data saved to {}", parquet_path)
+
+
+def _to_arrow(df: pd.DataFrame, schema: pa.Schema | None = None) -> pa.Table:
+    """
+    Convert a cleaned DataFrame to an Arrow table for Parquet.
+
+    Args:
+        df (pd.DataFrame): Cleaned DataFrame.
+        schema (pa.Schema | None): Schema to cast to (keeps streamed batches consistent).
+
+    Returns:
+        pa.Table: Arrow table without the pandas index.
+    """
+    # Text placeholders (e.g. "unknown" in a numeric column) leave some columns mixing numbers
+    # and strings, which Parquet cannot store, so those columns are written as text
+    text_columns = set(df.select_dtypes(include="object").columns)
+    if schema is not None:
+        # Streamed batches follow the first batch's schema, so its text columns stay text here
+        text_columns.update(
+            column.name
+            for column in schema
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type)
+        )
+    table = pa.Table.from_pandas(
+        df.astype(dict.fromkeys(text_columns, "str")), preserve_index=False
+    )
+    if schema is None:
+        # Categoricals are stored as plain values, so the file schema does not depend on the
+        # categories seen (whole file or one streamed batch)
+        schema = pa.schema(
+            field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ).with_metadata(table.schema.metadata)
+    return table.cast(schema)
+
+
+def remove_duplicates(df: pd.DataFrame, cfg: PipelineConfig) -> pd.DataFrame:
+    """
+    Remove duplicate records, keeping the first row for each id.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        cfg (PipelineConfig): Pipeline configuration.
+
+    Returns:
+        pd.DataFrame: DataFrame with duplicates removed.
+    """
+    logger.info("FUNCTION START: remove_duplicates with dataframe shape={}", df.shape)
+    initial_count = len(df)
+
+    # A record is identified by its id, so only that column needs hashing
+    df = df.drop_duplicates(subset=[cfg.id_column], keep="first", ignore_index=True)
+
+    removed_count = initial_count - len(df)
+    logger.info("Removed {} duplicate rows", removed_count)
+    logger.info("{} records remaining after removing duplicates.", len(df))
+    return df
+
+
+def compute_quartiles(df: pd.DataFrame, cfg: PipelineConfig) -> dict[str, np.ndarray]:
+    """
+    Compute Q1, median and Q3 for every column that needs them, in one pass.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        cfg (PipelineConfig): Pipeline configuration.
+
+    Returns:
+        dict[str, np.ndarray]: Column -> array of [Q1, median, Q3] (NaN skipped).
+    """
+    columns = list(dict.fromkeys(cfg.median_fill_columns + cfg.iqr_columns))
+    if not columns:
+        return {}
+    # One contiguous float array, so the median fill and the IQR bounds share a single pass
+    values = df[columns].to_numpy(dtype=np.float64)
+    quartiles = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0)
+    return dict(zip(columns, quartiles.T, strict=True))
+
+
+def handle_missing_values(
+    df: pd.DataFrame, cfg: PipelineConfig, quartiles: dict[str, np.ndarray]
+) -> pd.DataFrame:
+    """
+    Handle missing values by dropping or filling.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        cfg (PipelineConfig): Pipeline configuration.
+        quartiles (dict[str, np.ndarray]): Output of compute_quartiles.
+
+    Returns:
+        pd.DataFrame: DataFrame with missing values handled.
+    """
+    logger.info("FUNCTION START: handle_missing_values with dataframe shape={}", df.shape)
+
+    # Log missing values by column before handling
+    logger.opt(lazy=True).debug(
+        "Missing values by column before handling:\n{}", lambda: df.isna().sum()
+    )
+
+    if cfg.required_columns:
+        df = df.dropna(subset=list(cfg.required_columns))
+
+    fill_values = dict(cfg.fill)
+    for col in cfg.median_fill_columns:
+        fill_values[col] = quartiles[col][1]
+
+    # Categorical columns only accept known values, so register fill labels that will be used
+    for col, value in fill_values.items():
+        column = df[col]
+        if (
+            isinstance(column.dtype, pd.CategoricalDtype)
+            and column.hasnans
+            and value not in column.cat.categories
+        ):
+            df[col] = column.cat.add_categories([value])
+
+    df = df.fillna(fill_values)
+
+    # Log missing values by column after handling
+    logger.opt(lazy=True).debug(
+        "Missing values by column after handling:\n{}", lambda: df.isna().sum()
+    )
+    logger.info("{} records remaining after handling missing values.", len(df))
+    return df
+
+
+def remove_outliers(
+    df: pd.DataFrame, cfg: PipelineConfig, quartiles: dict[str, np.ndarray]
+) -> pd.DataFrame:
+    """
+    Remove outliers based on IQR bounds and fixed limits.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        cfg (PipelineConfig): Pipeline configuration.
+        quartiles (dict[str, np.ndarray]): Output of compute_quartiles.
+
+    Returns:
+        pd.DataFrame: DataFrame with outliers removed.
+    """
+    logger.info("FUNCTION START: remove_outliers with dataframe shape={}", df.shape)
+    initial_count = len(df)
+
+    # Every rule adds to one combined mask, so the frame is sliced only once
+    in_bounds = np.ones(len(df), dtype=bool)
+    for col in cfg.iqr_columns:
+        Q1, _, Q3 = quartiles[col]
+        IQR = Q3 - Q1
+        lower_bound = Q1 - 1.5 * IQR
+        upper_bound = Q3 + 1.5 * IQR
+        values = df[col].to_numpy(dtype=np.float64)
+        in_bounds &= (values >= lower_bound) & (values <= upper_bound)
+        logger.info("Applied outlier removal to {}: bounds [{}, {}]", col, lower_bound, upper_bound)
+    for col, limit in cfg.upper_limits.items():
+        in_bounds &= df[col].to_numpy(dtype=np.float64) < limit
+        logger.info("Applied outlier removal to {}: below {}", col, limit)
+    df = df.loc[in_bounds]
+
+    removed_count = initial_count - len(df)
+    logger.info("Removed {} outlier rows", removed_count)
+    logger.info("{} records remaining after removing outliers.", len(df))
+    return df
+
+
+def validate_data(df: pd.DataFrame, cfg: PipelineConfig) -> pd.DataFrame:
+    """
+    Validate data against business rules.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        cfg (PipelineConfig): Pipeline configuration.
+
+    Returns:
+        pd.DataFrame: Validated DataFrame.
+    """
+    if not cfg.min_values:
+        return df
+    logger.info("FUNCTION START: validate_data with dataframe shape={}", df.shape)
+
+    valid = np.ones(len(df), dtype=bool)
+    for col, minimum in cfg.min_values.items():
+        column_valid = df[col].to_numpy(dtype=np.float64) >= minimum
+        logger.info("Found {} rows with {} below {}", (~column_valid).sum(), col, minimum)
+        valid &= column_valid
+    df = df.loc[valid]
+
+    logger.info("Data validation complete")
+    return df
+
+
+def _apply_unique(series: pd.Series, fn: Callable[[str], str]) -> pd.Series:
+    """
+    Apply a string function once per distinct value instead of once per row.
+
+    Args:
+        series (pd.Series): Text column, plain or categorical.
+        fn (Callable[[str], str]): Function to apply, e.g. str.title.
+
+    Returns:
+        pd.Series: Transformed column (missing values stay missing).
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categoricals already hold their distinct values, so only the categories are transformed
+        return series.map(fn, na_action="ignore")
+    uniques = series.dropna().unique()
+    return series.map(dict(zip(uniques, map(fn, uniques), strict=True)))
+
+
+def _parse_dates(series: pd.Series, formats: tuple[str, ...]) -> pd.Series:
+    """
+    Parse dates that may come in several exact formats.
+
+    Args:
+        series (pd.Series): Text column of dates.
+        formats (tuple[str, ...]): Accepted formats, tried in order.
+
+    Returns:
+        pd.Series: Parsed datetimes (NaT where no format matches).
+    """
+    # One exact-format pass per format keeps parsing off the slow per-row 'mixed' parser
+    parsed = pd.to_datetime(series, format=formats[0], errors="coerce", cache=True)
+    for date_format in formats[1:]:
+        parsed = parsed.fillna(
+            pd.to_datetime(series, format=date_format, errors="coerce", cache=True)
+        )
+    return parsed
+
+
+def _format_dates(dates: pd.Series) -> pd.Series:
+    """
+    Format datetimes as DATE_OUTPUT_FORMAT text, once per distinct date.
+
+    Args:
+        dates (pd.Series): Parsed datetimes.
+
+    Returns:
+        pd.Series: Formatted dates (NaT becomes missing).
+    """
+    # Sales data repeats a small set of dates, so strftime runs on the distinct dates only
+    # and every row takes its text by integer code (code -1 for NaT picks the trailing NaN)
+    codes, uniques = pd.factorize(dates)
+    formatted = np.append(uniques.strftime(DATE_OUTPUT_FORMAT).to_numpy(dtype=object), np.nan)
+    return pd.Series(formatted[codes], index=dates.index, dtype="str")
+
+
+def standardize_formats(df: pd.DataFrame, cfg: PipelineConfig) -> pd.DataFrame:
+    """
+    Standardize the formatting of various columns.
+
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        cfg (PipelineConfig): Pipeline configuration.
+
+    Returns:
+        pd.DataFrame: DataFrame with standardized formatting.
+    """
+    logger.info("FUNCTION START: standardize_formats with dataframe shape={}", df.shape)
+
+    for col, formats in cfg.date_columns.items():
+        df[col] = _format_dates(_parse_dates(df[col], formats))
+        if cfg.fill_unparsed_dates and col in cfg.fill:
+            # Missing dates were filled before parsing, so this only catches unparseable text
+            df[col] = df[col].fillna(cfg.fill[col])
+    for col in cfg.title_columns:
+        df[col] = _apply_unique(df[col], str.title)
+    for col in cfg.lower_columns:
+        df[col] = _apply_unique(df[col], str.lower)
+    for col in cfg.round2_columns:
+        df[col] = df[col].round(2)  # Round prices to 2 decimal places
+    if cfg.int_columns:
+        df = df.astype(dict(cfg.int_columns))
+
+    logger.info("Completed standardizing formats")
+    return df
+
+
+def clean_data(
+    df: pd.DataFrame, cfg: PipelineConfig, quartiles: dict[str, np.ndarray]
+) -> pd.DataFrame:
+    """
+    Handle missing values, remove outliers, validate data and standardize formats.
+
+    Args:
+        df (pd.DataFrame): Deduplicated DataFrame (or batch).
+        cfg (PipelineConfig): Pipeline configuration.
+        quartiles (dict[str, np.ndarray]): Output of compute_quartiles for the whole file.
+
+    Returns:
+        pd.DataFrame: Cleaned DataFrame.
+    """
+    # One chain (copy-on-write avoids defensive copies)
+    return (
+        df.pipe(handle_missing_values, cfg, quartiles)
+        .pipe(remove_outliers, cfg, quartiles)
+        .pipe(validate_data, cfg)
+        .pipe(standardize_formats, cfg)
+    )
+
+
+def stream_pipeline(cfg: PipelineConfig, block_size: int = STREAMING_BLOCK_SIZE) -> None:
+    """
+    Clean and save a raw data file batch by batch, for files too large to load whole.
+
+    A first pass reads only the id and quartile columns to find the duplicate rows and
+    get the whole-file quartiles.
+    The second pass cleans each batch and appends it to the CSV and Parquet outputs.
+
+    Args:
+        cfg (PipelineConfig): Pipeline configuration.
+        block_size (int): Bytes of raw CSV read per batch.
+    """
+    logger.info("FUNCTION START: stream_pipeline with block_size={}", block_size)
+
+    # First pass: the id and quartile columns only
+    quartile_columns = list(dict.fromkeys(cfg.median_fill_columns + cfg.iqr_columns))
+    key_columns = [cfg.id_column, *quartile_columns]
+    keys = pd.concat(
+        [batch[key_columns] for batch in iter_raw_batches(cfg, block_size)], ignore_index=True
+    )
+    # Duplicates can span batches, so one keep mask (first row per id) is built for the
+    # whole file; duplicated() hashes integer ids natively, with no Python set of boxed ids
+    keep = ~keys[cfg.id_column].duplicated().to_numpy()
+    logger.info("Removed {} duplicate rows", len(keep) - keep.sum())
+    quartiles: dict[str, np.ndarray] = {}
+    if quartile_columns:
+        quartiles = compute_quartiles(keys.loc[keep], cfg)
+    del keys
+
+    # Second pass: clean each batch and append it to the outputs
+    csv_path = PREPARED_DATA_DIR.joinpath(cfg.output_file)
+    parquet_path = csv_path.with_suffix(".parquet")
+    parquet_writer = None
+    row_count = 0
+    offset = 0
+    try:
+        for batch in iter_raw_batches(cfg, block_size):
+            # The reader splits the file the same way on both passes, so the batch rows
+            # line up with the next slice of the keep mask
+            batch_keep = keep[offset : offset + len(batch)]
+            offset += len(batch)
+
+            batch = clean_data(batch.loc[batch_keep], cfg, quartiles)
+            batch.to_csv(
+                csv_path,
+                index=False,
+                mode="w" if parquet_writer is None else "a",
+                header=parquet_writer is None,
+            )
+            if parquet_writer is None:
+                table = _to_arrow(batch)
+                parquet_writer = pq.ParquetWriter(parquet_path, table.schema, compression="zstd")
+            else:
+                table = _to_arrow(batch, parquet_writer.schema)
+            parquet_writer.write_table(table)
+            row_count += len(batch)
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    logger.info("Data saved to {} and {}", csv_path, parquet_path)
+    logger.info("Cleaned rows: {}", row_count)
+
+
+#####################################
+# Define the Pipeline Entry Point
+#####################################
+
+
+def run_pipeline(cfg: PipelineConfig) -> None:
+    """
+    Read, clean and save one raw data file.
+
+    Files larger than STREAMING_THRESHOLD_BYTES are streamed in batches (see stream_pipeline).
+
+    Args:
+        cfg (PipelineConfig): Pipeline configuration.
+    """
+    # INFO level, so the lazy DEBUG profiling (nunique, isna counts) is skipped
+    init_logger()
+
+    logger.info("==================================")
+    logger.info("STARTING {}", cfg.name)
+    logger.info("==================================")
+
+    logger.info("Root         : {}", PROJECT_ROOT)
+    logger.info("data/raw     : {}", RAW_DATA_DIR)
+    logger.info("data/prepared: {}", PREPARED_DATA_DIR)
+
+    # Ensure the directories exist or create them
+    RAW_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    PREPARED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+    if RAW_DATA_DIR.joinpath(cfg.input_file).stat().st_size > STREAMING_THRESHOLD_BYTES:
+        # Peak memory stays bounded by the batch size instead of the file size
+        stream_pipeline(cfg)
+    else:
+        # Read raw data
+        df = read_raw_data(cfg)
+        original_shape = df.shape
+
+        # Coerce text columns to numbers ("?" and similar junk become NaN)
+        for col in cfg.numeric_columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+        df = remove_duplicates(df, cfg)
+
+        # Quartiles feed both the median fill and the IQR bounds, so they are computed once
+        quartiles = compute_quartiles(df, cfg)
+        df = clean_data(df, cfg, quartiles)
+
+        # Save prepared data
+        save_prepared_data(df, cfg)
+
+        logger.info("==================================")
+        logger.info("Original shape: {}", original_shape)
+        logger.info("Cleaned shape:  {}", df.shape)
+
+    logger.info("==================================")
+    logger.info("FINISHED {}", cfg.name)
+    logger.info("==================================")
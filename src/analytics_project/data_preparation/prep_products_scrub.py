@@ -20,283 +20,62 @@ Tasks:
 import pathlib
 import sys
 
-# Import from external packages (requires a virtual environment)
-import pandas as pd
-
 # Ensure project root is in sys.path for local imports (now 3 parents are needed)
 sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent.parent))
 
 # Import local modules (e.g. utils/logger.py)
-from analytics_project.utils_logger import logger
-
-# Optional: Use a data_scrubber module for common data cleaning tasks
-from analytics_project.utils_scrubber import DataScrubber
-
-
-# Constants
-SCRIPTS_DATA_PREP_DIR: pathlib.Path = (
-    pathlib.Path(__file__).resolve().parent
-)  # Directory of the current script
-SCRIPTS_DIR: pathlib.Path = SCRIPTS_DATA_PREP_DIR.parent  # analytics project
-PROJECT_ROOT: pathlib.Path = SCRIPTS_DIR.parent  # scr
-DATA_DIR: pathlib.Path = PROJECT_ROOT / "data"
-RAW_DATA_DIR: pathlib.Path = DATA_DIR / "raw"
-PREPARED_DATA_DIR: pathlib.Path = DATA_DIR / "prepared"  # place to store prepared data
-
-
-# Ensure the directories exist or create them
-DATA_DIR.mkdir(exist_ok=True)
-RAW_DATA_DIR.mkdir(exist_ok=True)
-PREPARED_DATA_DIR.mkdir(exist_ok=True)
-
-#####################################
-# Define Functions - Reusable blocks of code / instructions
-#####################################
-
-
-def read_raw_data(file_name: str) -> pd.DataFrame:
-    """
-    Read raw data from CSV.
-
-    Args:
-        file_name (str): Name of the CSV file to read.
-
-    Returns:
-        pd.DataFrame: Loaded DataFrame.
-    """
-    logger.info(f"FUNCTION START: read_raw_data with file_name={file_name}")
-    file_path = RAW_DATA_DIR.joinpath(file_name)
-    logger.info(f"Reading data from {file_path}")
-    df = pd.read_csv(file_path)
-    logger.info(f"Loaded dataframe with {len(df)} rows and {len(df.columns)} columns")
-
-    return df
-
-
-def save_prepared_data(df: pd.DataFrame, file_name: str) -> None:
-    """
-    Save cleaned data to CSV.
-
-    Args:
-        df (pd.DataFrame): Cleaned DataFrame.
-        file_name (str): Name of the output file.
-    """
-    logger.info(
-        f"FUNCTION START: save_prepared_data with file_name={file_name}, dataframe shape={df.shape}"
-    )
-    file_path = PREPARED_DATA_DIR.joinpath(file_name)
-    df.to_csv(file_path, index=False)
-    logger.info(f"Data saved to {file_path}")
-
-
-def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Remove duplicate rows from the DataFrame.
-
-    Args:
-        df (pd.DataFrame): Input DataFrame.
-
-    Returns:
-        pd.DataFrame: DataFrame with duplicates removed.
-    """
-    logger.info(f"FUNCTION START: remove_duplicates with dataframe shape={df.shape}")
-    initial_count = len(df)
-
-    # Delegate to DataScrubber class
-    df_scrubber = DataScrubber(df)
-
-    # Remove duplicates based on 'product_id'
-    df_deduped = df_scrubber.remove_duplicate_records()
-
-    removed_count = initial_count - len(df_deduped)
-    logger.info(f"Removed {removed_count} duplicate rows")
-    logger.info(f"{len(df_deduped)} records remaining after removing duplicates.")
-    return df_deduped
-
-
-def rename_columns(df: pd.DataFrame) -> pd.DataFrame:
-    # Change column names to match the standard formatting
-
-    logger.info("Function Start: rename_columns")
-
-    # Log columns BEFORE renaming
-    logger.info(f"Columns BEFORE renaming: {df.columns.tolist()}")
-
-    column_mapping = {
+from analytics_project.data_preparation.pipeline import PipelineConfig, run_pipeline
+
+# Cleaning rules for the raw products file (see pipeline.PipelineConfig)
+# Category and PurchaseType hold a handful of distinct values, so they are read as categoricals
+PRODUCTS_CONFIG = PipelineConfig(
+    name="prepare_products_data.py",
+    input_file="products_data.csv",
+    output_file="products_prepared.csv",
+    id_column="product_id",
+    # IDs fit in int32, half the bytes of int64 in every later pass; nullable Int32 lets a
+    # blank id through to the missing-value rules instead of failing the read
+    dtypes={
+        "ProductID": "Int32",
+        "UnitPrice": "float64",
+        "StockQuantity": "float64",
+        "Category": "category",
+        "PurchaseType": "category",
+    },
+    rename={
         "ProductID": "product_id",
         "ProductName": "product_name",
         "Category": "category",
         "UnitPrice": "unit_price",
         "StockQuantity": "stock_quantity",
         "PurchaseType": "purchase_type",
-    }
-
-    df = df.rename(columns=column_mapping)
-
-    # Log columns AFTER renaming
-    logger.info(f"Columns AFTER renaming: {df.columns.tolist()}")
+    },
+    fill={
+        "product_name": "Unknown Product",
+        "category": "unknown category",
+        "stock_quantity": 0,
+        "purchase_type": "unknown preference",
+    },
+    median_fill_columns=("unit_price",),
+    iqr_columns=("unit_price", "stock_quantity"),
+    min_values={"unit_price": 0, "stock_quantity": 0},
+    title_columns=("product_name",),  # Title case for product names
+    lower_columns=("category",),  # Lowercase for categories
+    round2_columns=("unit_price",),
+    int_columns={"stock_quantity": "int32"},
+)
 
-    logger.info("Function End: rename_columns")
-    return df
 
-
-def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Handle missing values by filling or dropping.
-    This logic is specific to the actual data and business rules.
-
-    Args:
-        df (pd.DataFrame): Input DataFrame.
-
-    Returns:
-        pd.DataFrame: DataFrame with missing values handled.
-    """
-    logger.info(f"FUNCTION START: handle_missing_values with dataframe shape={df.shape}")
-
-    # Log missing values by column before handling
-    # NA means missing or "not a number" - ask your AI for details
-    missing_by_col = df.isna().sum()
-    logger.info(f"Missing values by column before handling:\n{missing_by_col}")
-
-    df["product_name"] = df["product_name"].fillna("Unknown Product")
-    df["category"] = df["category"].fillna("unknown category")
-    df["unit_price"] = df["unit_price"].fillna(df["unit_price"].median())
-    df["stock_quantity"] = df["stock_quantity"].fillna(0)
-    df.dropna(subset=["product_name"])  # Remove rows without product code
-    df["purchase_type"] = df["purchase_type"].fillna("unknown preference")
-
-    # Log missing values by column after handling
-    missing_after = df.isna().sum()
-    logger.info(f"Missing values by column after handling:\n{missing_after}")
-    logger.info(f"{len(df)} records remaining after handling missing values.")
-    return df
-
-
-def remove_outliers(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Remove outliers based on thresholds.
-    This logic is very specific to the actual data and business rules.
-
-    Args:
-        df (pd.DataFrame): Input DataFrame.
-
-    Returns:
-        pd.DataFrame: DataFrame with outliers removed.
-    """
-    logger.info(f"FUNCTION START: remove_outliers with dataframe shape={df.shape}")
-    initial_count = len(df)
-
-    for col in ["unit_price", "stock_quantity"]:
-        if col in df.columns and df[col].dtype in ['int64', 'float64']:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            df = df[(df[col] >= lower_bound) & (df[col] <= upper_bound)]
-            logger.info(f"Applied outlier removal to {col}: bounds [{lower_bound}, {upper_bound}]")
-
-    removed_count = initial_count - len(df)
-    logger.info(f"Removed {removed_count} outlier rows")
-    logger.info(f"{len(df)} records remaining after removing outliers.")
-    return df
-
-
-def standardize_formats(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Standardize the formatting of various columns.
-
-    Args:
-        df (pd.DataFrame): Input DataFrame.
-
-    Returns:
-        pd.DataFrame: DataFrame with standardized formatting.
-    """
-    logger.info(f"FUNCTION START: standardize_formats with dataframe shape={df.shape}")
-
-    df['product_name'] = df['product_name'].str.title()  # Title case for product names
-    df['category'] = df['category'].str.lower()  # Lowercase for categories
-    df["unit_price"] = df["unit_price"].round(2)  # Round prices to 2 decimal places
-    df["stock_quantity"] = df["stock_quantity"].astype(int)  # Turns into integer
-
-    logger.info("Completed standardizing formats")
-    return df
-
-
-def validate_data(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Validate data against business rules.
-
-    Args:
-        df (pd.DataFrame): Input DataFrame.
-
-    Returns:
-        pd.DataFrame: Validated DataFrame.
-    """
-    logger.info(f"FUNCTION START: validate_data with dataframe shape={df.shape}")
-
-    invalid_prices = df[df["unit_price"] < 0].shape[0]
-    logger.info(f"Found {invalid_prices} products with negative prices")
-    df = df[df["unit_price"] >= 0]
-    df = df[df["stock_quantity"] >= 0]
-
-    logger.info("Data validation complete")
-    return df
+#####################################
+# Define Main Function - The main entry point of the script
+#####################################
 
 
 def main() -> None:
     """
     Main function for processing product data.
     """
-    logger.info("==================================")
-    logger.info("STARTING prepare_products_data.py")
-    logger.info("==================================")
-
-    logger.info(f"Root         : {PROJECT_ROOT}")
-    logger.info(f"data/raw     : {RAW_DATA_DIR}")
-    logger.info(f"data/prepared: {PREPARED_DATA_DIR}")
-    logger.info(f"scripts      : {SCRIPTS_DIR}")
-
-    input_file = "products_data.csv"
-    output_file = "products_prepared.csv"
-
-    # Read raw data
-    df = read_raw_data(input_file)
-
-    # Record original shape
-    original_shape = df.shape
-
-    # Log initial dataframe information
-    logger.info(f"Initial dataframe columns: {', '.join(df.columns.tolist())}")
-    logger.info(f"Initial dataframe shape: {df.shape}")
-
-    # Rename Columns
-    df = rename_columns(df)
-
-    # Remove duplicates
-    df = remove_duplicates(df)
-
-    # Handle missing values
-    df = handle_missing_values(df)
-
-    # Remove Outliers
-    df = remove_outliers(df)
-
-    # Validate data
-    df = validate_data(df)
-
-    # Standardize formats
-    df = standardize_formats(df)
-
-    # Save prepared data
-    save_prepared_data(df, output_file)
-
-    logger.info("==================================")
-    logger.info(f"Original shape: {df.shape}")
-    logger.info(f"Cleaned shape:  {original_shape}")
-    logger.info("==================================")
-    logger.info("FINISHED prepare_products_data.py")
-    logger.info("==================================")
+    run_pipeline(PRODUCTS_CONFIG)
 
 
 # -------------------
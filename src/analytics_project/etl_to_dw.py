@@ -1,20 +1,25 @@
 # Imports at the top
 
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import closing
 import pathlib
 import sqlite3
-import sys
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
-# Ensure project root is in sys.path for local imports
-sys.path.append(str(pathlib.Path(__file__).resolve().parent.parent))
-
-# Import local modules (e.g. utils/logger.py)
+# Import local modules (e.g. utils/logger.py) from the installed package (uv sync installs it)
 from analytics_project.utils_logger import logger
 
 # Global constants for paths and key directories
 
-THIS_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent
+# __file__ is already absolute, so the paths are derived without resolve() calls
+THIS_DIR: pathlib.Path = pathlib.Path(__file__).parent
 PACKAGE_DIR: pathlib.Path = THIS_DIR  # src/analytics_project/
 SRC_DIR: pathlib.Path = PACKAGE_DIR.parent  # src/
 PROJECT_ROOT_DIR: pathlib.Path = SRC_DIR.parent  # smart-store2-kehummel/
@@ -28,117 +33,336 @@ WAREHOUSE_DIR: pathlib.Path = DATA_DIR / "warehouse"
 # Warehouse database location (SQLite)
 DB_PATH: pathlib.Path = WAREHOUSE_DIR / "smart_sales.db"
 
-# Recommended - log paths and key directories for debugging
-
-logger.info(f"THIS_DIR:            {THIS_DIR}")
-logger.info(f"PACKAGE_DIR:         {PACKAGE_DIR}")
-logger.info(f"SRC_DIR:             {SRC_DIR}")
-logger.info(f"PROJECT_ROOT_DIR:    {PROJECT_ROOT_DIR}")
-
-logger.info(f"DATA_DIR:            {DATA_DIR}")
-logger.info(f"RAW_DATA_DIR:        {RAW_DATA_DIR}")
-logger.info(f"CLEAN_DATA_DIR:      {CLEAN_DATA_DIR}")
-logger.info(f"WAREHOUSE_DIR:       {WAREHOUSE_DIR}")
-logger.info(f"DB_PATH:             {DB_PATH}")
+# Stored in PRAGMA user_version by create_schema; bump it whenever the table definitions change
+SCHEMA_VERSION: int = 2
+
+# Table columns in schema order, and the INSERT statements that bind them positionally
+# (each table ignores rows whose primary key is already loaded, which drops duplicates)
+CUSTOMER_COLUMNS: list[str] = [
+    "customer_id",
+    "name",
+    "region",
+    "join_date",
+    "number_of_purchases",
+    "contact_preferences",
+]
+PRODUCT_COLUMNS: list[str] = [
+    "product_id",
+    "product_name",
+    "category",
+    "unit_price",
+    "stock_quantity",
+    "purchase_type",
+]
+SALE_COLUMNS: list[str] = [
+    "sales_id",
+    "sale_date",
+    "customer_id",
+    "product_id",
+    "store_id",
+    "campaign_id",
+    "sales_amount",
+    "number_of_items",
+    "city",
+]
+
+# Column types for reading the prepared CSVs, so the reader does not infer them
+# (IDs and counts fit in int32; amounts are read as float64 and stored as whole cents)
+CUSTOMER_DTYPES: dict[str, str] = {
+    "customer_id": "int32",
+    "name": "str",
+    "region": "str",
+    "join_date": "str",
+    "number_of_purchases": "int32",
+    "contact_preferences": "str",
+}
+PRODUCT_DTYPES: dict[str, str] = {
+    "product_id": "int32",
+    "product_name": "str",
+    "category": "str",
+    "unit_price": "float64",
+    "stock_quantity": "int32",
+    "purchase_type": "str",
+}
+SALE_DTYPES: dict[str, str] = {
+    "sales_id": "int32",
+    "sale_date": "str",
+    "customer_id": "int32",
+    "product_id": "int32",
+    "store_id": "int32",
+    "campaign_id": "int32",
+    "sales_amount": "float64",
+    "number_of_items": "int32",
+    "city": "str",
+}
+
+CUSTOMER_INSERT_SQL: str = "INSERT OR IGNORE INTO customer VALUES (?, ?, ?, ?, ?, ?)"
+PRODUCT_INSERT_SQL: str = "INSERT OR IGNORE INTO product VALUES (?, ?, ?, ?, ?, ?)"
+SALE_INSERT_SQL: str = "INSERT OR IGNORE INTO sale VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Warehouse tables, created by one executescript call
+SCHEMA_SQL: str = """
+    CREATE TABLE IF NOT EXISTS customer (
+        customer_id INTEGER PRIMARY KEY,
+        name TEXT,
+        region TEXT,
+        join_date TEXT,
+        number_of_purchases INTEGER,
+        contact_preferences TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS product (
+        product_id INTEGER PRIMARY KEY,
+        product_name TEXT,
+        category TEXT,
+        unit_price INTEGER,  -- whole cents
+        stock_quantity INTEGER,
+        purchase_type TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS sale (
+        sales_id INTEGER PRIMARY KEY,
+        sale_date TEXT,
+        customer_id INTEGER,
+        product_id INTEGER,
+        store_id INTEGER,
+        campaign_id INTEGER,
+        sales_amount INTEGER,  -- whole cents
+        number_of_items INTEGER,
+        city TEXT,
+        FOREIGN KEY (customer_id) REFERENCES customer (customer_id),
+        FOREIGN KEY (product_id) REFERENCES product (product_id)
+    );
+"""
+
+# Indexes on the sale foreign key columns, built once the data is loaded
+# (building each index once over the loaded table is cheaper than updating it on every insert),
+# and views that show the money columns in dollars for reports such as the Power BI visuals
+POST_LOAD_SQL: str = """
+    CREATE INDEX IF NOT EXISTS idx_sale_customer ON sale (customer_id);
+    CREATE INDEX IF NOT EXISTS idx_sale_product ON sale (product_id);
+
+    CREATE VIEW IF NOT EXISTS sale_dollars AS
+        SELECT sales_id, sale_date, customer_id, product_id, store_id, campaign_id,
+               sales_amount / 100.0 AS sales_amount, number_of_items, city
+        FROM sale;
+
+    CREATE VIEW IF NOT EXISTS product_dollars AS
+        SELECT product_id, product_name, category, unit_price / 100.0 AS unit_price,
+               stock_quantity, purchase_type
+        FROM product;
+"""
+
+# Prepared files are read and inserted in batches, so memory stays bounded for large files
+BATCH_ROWS: int = 50_000  # rows per batch from a Parquet copy
+CSV_BLOCK_SIZE: int = 4 * 1024 * 1024  # bytes of CSV per batch (about 50,000 sale rows)
+
+# Every load keeps temp data and a 64 MB page cache in memory
+BULK_LOAD_PRAGMAS: list[str] = [
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA foreign_keys = OFF",  # FK clauses document the schema; they are not checked per row
+]
+
+# A newly created file holds nothing but this load, so its load also skips the on-disk
+# rollback journal and fsyncs. A reused file keeps SQLite's defaults, so an interrupted load
+# rolls back to the previous warehouse instead of damaging it
+NEW_DB_PRAGMAS: list[str] = [
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+]
 
 
 def create_schema(cursor: sqlite3.Cursor) -> None:
     """Create tables in the data warehouse if they don't exist."""
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS customer (
-            customer_id INTEGER PRIMARY KEY,
-            name TEXT,
-            region TEXT,
-            join_date TEXT,
-            number_of_purchases INTEGER,
-            contact_preferences TEXT
-        )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS product (
-            product_id INTEGER PRIMARY KEY,
-            product_name TEXT,
-            category TEXT,
-            unit_price REAL,
-            stock_quantity INTEGER,
-            purchase_type TEXT
-        )
-    """)
-
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sale (
-            sales_id INTEGER PRIMARY KEY,
-            sale_date TEXT,
-            customer_id INTEGER,
-            product_id INTEGER,
-            store_id INTEGER,
-            campaign_id INTEGER,
-            sales_amount REAL,
-            number_of_items INTEGER,
-            city TEXT,
-            FOREIGN KEY (customer_id) REFERENCES customer (customer_id),
-            FOREIGN KEY (product_id) REFERENCES product (product_id)
-        )
-   """)
+    cursor.executescript(SCHEMA_SQL)
+    # Stamped once the tables exist, so a file left half-created is never treated as current
+    # (PRAGMA values cannot be bound as parameters)
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 
-def insert_customers(customers_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
-    """Insert customer data into the customer table."""
+def get_schema_version(db_path: pathlib.Path) -> int:
+    """Return the schema version stored in an existing warehouse database (0 if unreadable)."""
+    try:
+        with closing(sqlite3.connect(db_path)) as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+    except sqlite3.DatabaseError as e:
+        # A damaged or non-SQLite file counts as outdated, so the load replaces it
+        logger.warning("Cannot read warehouse database at {}: {}", db_path, e)
+        return 0
+
+
+def clear_tables(cursor: sqlite3.Cursor) -> None:
+    """Delete all rows from the warehouse tables, keeping the tables themselves."""
+    # Child table first, then the tables it references
+    cursor.execute("DELETE FROM sale")
+    cursor.execute("DELETE FROM product")
+    cursor.execute("DELETE FROM customer")
+    # The indexes are rebuilt after the load (see create_indexes)
+    cursor.execute("DROP INDEX IF EXISTS idx_sale_customer")
+    cursor.execute("DROP INDEX IF EXISTS idx_sale_product")
+
+
+def create_indexes(cursor: sqlite3.Cursor) -> None:
+    """Index the sale foreign key columns once the data is loaded."""
+    # executescript commits any open transaction first, so this runs after the load's COMMIT
+    cursor.executescript(POST_LOAD_SQL)
+
+
+def arrow_schema(dtypes: dict[str, str]) -> pa.Schema:
+    """Return the Arrow schema matching a dict of pandas column types."""
+    return pa.schema(
+        (column, pa.string() if dtype == "str" else pa.from_numpy_dtype(np.dtype(dtype)))
+        for column, dtype in dtypes.items()
+    )
+
+
+def iter_prepared(file_name: str, dtypes: dict[str, str]) -> Iterator[pa.RecordBatch]:
+    """Read a prepared CSV, or its Parquet copy when that is up to date, in Arrow batches."""
+    csv_path = CLEAN_DATA_DIR.joinpath(file_name)
+    parquet_path = csv_path.with_suffix(".parquet")
+    schema = arrow_schema(dtypes)
+
+    # The data preparation scripts save a Parquet copy next to each CSV; when it is at least as
+    # new as the CSV it holds the same rows and loads without parsing any text
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        logger.info(f"Reading {parquet_path.name} (up to date with {file_name})")
+        parquet_file = pq.ParquetFile(parquet_path)
+        for batch in parquet_file.iter_batches(batch_size=BATCH_ROWS, columns=schema.names):
+            # Copies written by the preparation scripts may use other types (e.g. categories)
+            yield batch.select(schema.names).cast(schema)
+        return
+
+    # Arrow's streaming CSV reader parses one block at a time (multithreaded, into columnar memory)
+    logger.info(f"Reading {file_name}")
+    read_options = pa_csv.ReadOptions(block_size=CSV_BLOCK_SIZE)
+    convert_options = pa_csv.ConvertOptions(
+        column_types=schema, include_columns=schema.names, strings_can_be_null=True
+    )
+
+    # Cache the parsed data as Parquet so the next run skips the CSV parse; the copy only
+    # takes the cache name once the whole CSV has been read
+    partial_path = parquet_path.with_suffix(".parquet.partial")
+    try:
+        with (
+            pa_csv.open_csv(
+                csv_path, read_options=read_options, convert_options=convert_options
+            ) as reader,
+            pq.ParquetWriter(partial_path, reader.schema, compression="zstd") as writer,
+        ):
+            for batch in reader:
+                writer.write_batch(batch)
+                yield batch
+        partial_path.replace(parquet_path)
+    finally:
+        # A failed read or a generator closed early leaves no half-written copy behind
+        partial_path.unlink(missing_ok=True)
 
-    # Check what's already in the database
-    cursor.execute("SELECT COUNT(*) FROM customer")
-    existing_count = cursor.fetchone()[0]
-    logger.info(f"Existing rows in customer table: {existing_count}")
 
-    logger.info(f"Attempting to insert {len(customers_df)} customer rows.")
+def read_prepared(file_name: str, dtypes: dict[str, str]) -> pd.DataFrame:
+    """Read a whole prepared file into a DataFrame (see iter_prepared)."""
+    batches = iter_prepared(file_name, dtypes)
+    return pa.Table.from_batches(batches, schema=arrow_schema(dtypes)).to_pandas()
 
-    # Check for duplicates in the dataframe
-    duplicates = customers_df[customers_df.duplicated(subset=['customer_id'], keep=False)]
-    logger.info(f"Duplicates in DataFrame: {len(duplicates)}")
 
-    if len(duplicates) > 0:
-        logger.warning(f"Duplicate customer_ids found: {duplicates['customer_id'].tolist()}")
-        logger.warning(f"Full duplicate rows:\n{duplicates}")
-        # Remove duplicates
-        customers_df = customers_df.drop_duplicates(subset=['customer_id'], keep='first')
-        logger.info(f"After removing duplicates: {len(customers_df)} rows remaining")
+def prefetch(batches: Iterator[pa.RecordBatch], executor: Executor) -> Iterator[pa.RecordBatch]:
+    """Yield batches while the next one is read on a worker thread."""
+    next_batch = executor.submit(next, batches, None)
+    while (batch := next_batch.result()) is not None:
+        next_batch = executor.submit(next, batches, None)
+        yield batch
 
-    customers_df.to_sql("customer", cursor.connection, if_exists="append", index=False)
 
+def to_rows(data: pd.DataFrame | pa.RecordBatch, columns: list[str]) -> Iterator[tuple]:
+    """Return the rows of the given columns as plain Python tuples for executemany."""
+    # Each column becomes Python values in one call (much faster than itertuples); Arrow
+    # batches convert straight from their buffers, without a pandas round trip
+    if isinstance(data, pa.RecordBatch):
+        column_values = (data.column(column).to_pylist() for column in columns)
+    else:
+        column_values = (data[column].tolist() for column in columns)
+    # zip is lazy, so executemany binds each row without a list of every row being built
+    return zip(*column_values, strict=True)
 
-def insert_products(products_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
-    """Insert product data into the product table."""
-    logger.info(f"Inserting {len(products_df)} product rows.")
-    products_df.to_sql("product", cursor.connection, if_exists="append", index=False)
 
+def to_cents(batch: pa.RecordBatch, column: str) -> pa.RecordBatch:
+    """Return the batch with a money column in whole cents (missing amounts stay null)."""
+    index = batch.schema.get_field_index(column)
+    cents = pc.round(pc.multiply(batch.column(index), 100)).cast(pa.int64())
+    return batch.set_column(index, column, cents)
 
-def insert_sales(sales_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
-    """Insert sales data into the sales table."""
-    logger.info(f"Inserting {len(sales_df)} sale rows.")
 
-    # Check for duplicates
-    duplicates = sales_df[sales_df.duplicated(subset=['sales_id'], keep=False)]
-    logger.info(f"Duplicates in DataFrame: {len(duplicates)}")
+def insert_customers(customers_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+    """Insert customer data into the customer table."""
+    logger.info(f"Attempting to insert {len(customers_df)} customer rows.")
+
+    # Bind all rows in one executemany call (to_sql inserts through the pandas fallback)
+    rows = to_rows(customers_df, CUSTOMER_COLUMNS)
+    cursor.executemany(CUSTOMER_INSERT_SQL, rows)
 
-    if len(duplicates) > 0:
-        logger.warning(f"Duplicate sales_ids found: {duplicates['sales_id'].unique().tolist()}")
-        # Remove duplicates
-        sales_df = sales_df.drop_duplicates(subset=['sales_id'], keep='first')
-        logger.info(f"After removing duplicates: {len(sales_df)} rows remaining")
+    # Duplicate customer_ids are ignored by the primary key (the first row for an id is kept)
+    skipped_count = len(customers_df) - cursor.rowcount
+    logger.info(f"Duplicate customer_ids skipped: {skipped_count}")
+    logger.info(f"Inserted {cursor.rowcount} customer rows.")
 
-    sales_df.to_sql("sale", cursor.connection, if_exists="append", index=False)
 
+def insert_products(products_df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+    """Insert product data into the product table."""
+    logger.info(f"Inserting {len(products_df)} product rows.")
 
-def load_data_to_db() -> None:
-    """Load clean data into the data warehouse."""
+    # Prices are stored as whole cents (INTEGER), so no float rounding reaches the warehouse
+    products = to_cents(pa.RecordBatch.from_pandas(products_df, preserve_index=False), "unit_price")
+    rows = to_rows(products, PRODUCT_COLUMNS)
+    cursor.executemany(PRODUCT_INSERT_SQL, rows)
+
+    # Duplicate product_ids are ignored by the primary key (the first row for an id is kept)
+    skipped_count = len(products_df) - cursor.rowcount
+    logger.info(f"Duplicate product_ids skipped: {skipped_count}")
+    logger.info(f"Inserted {cursor.rowcount} product rows.")
+
+
+def insert_sales(sales_batches: Iterable[pa.RecordBatch], cursor: sqlite3.Cursor) -> None:
+    """Insert sales data into the sales table, one batch at a time."""
+    # Duplicate sales_ids are ignored by the primary key (the first row for an id is kept),
+    # which also covers duplicates in different batches
+    row_count = 0
+    inserted_count = 0
+    for batch in sales_batches:
+        # Amounts are stored as whole cents (INTEGER), so no float rounding reaches the warehouse
+        batch = to_cents(batch, "sales_amount")
+        rows = to_rows(batch, SALE_COLUMNS)
+        cursor.executemany(SALE_INSERT_SQL, rows)
+        row_count += batch.num_rows
+        inserted_count += cursor.rowcount
+
+    logger.info(f"Duplicate sales_ids skipped: {row_count - inserted_count}")
+    logger.info(f"Inserted {inserted_count} sale rows.")
+
+
+def load_data_to_db(rebuild: bool = False) -> None:
+    """Load clean data into the data warehouse (rebuild=True recreates the database file)."""
     logger.info("Starting ETL: loading clean data into the warehouse.")
 
+    # Recommended - log paths and key directories for debugging
+    # Logged when the load runs (not on import), and only formatted if DEBUG is enabled
+    logger.debug("THIS_DIR:            {}", THIS_DIR)
+    logger.debug("PACKAGE_DIR:         {}", PACKAGE_DIR)
+    logger.debug("SRC_DIR:             {}", SRC_DIR)
+    logger.debug("PROJECT_ROOT_DIR:    {}", PROJECT_ROOT_DIR)
+
+    logger.debug("DATA_DIR:            {}", DATA_DIR)
+    logger.debug("RAW_DATA_DIR:        {}", RAW_DATA_DIR)
+    logger.debug("CLEAN_DATA_DIR:      {}", CLEAN_DATA_DIR)
+    logger.debug("WAREHOUSE_DIR:       {}", WAREHOUSE_DIR)
+    logger.debug("DB_PATH:             {}", DB_PATH)
+
     # Make sure the warehouse directory exists
     WAREHOUSE_DIR.mkdir(parents=True, exist_ok=True)
 
-    # If an old database exists, remove and recreate with the latest table definitions.
-    if DB_PATH.exists():
+    # Reuse an existing database whose tables match the current schema (its rows are replaced),
+    # otherwise remove it and recreate with the latest table definitions.
+    reuse_db = DB_PATH.exists() and not rebuild and get_schema_version(DB_PATH) == SCHEMA_VERSION
+    if DB_PATH.exists() and not reuse_db:
         logger.info(f"Removing existing warehouse database at: {DB_PATH}")
         DB_PATH.unlink()
 
@@ -148,26 +372,51 @@ def load_data_to_db() -> None:
 
     try:
         # Connect to SQLite. Create the file if it doesn't exist
-        conn = sqlite3.connect(DB_PATH)
+        # isolation_level=None turns off implicit transactions; the load opens its own below
+        # The INSERT constants are fixed strings (never formatted), so the statement cache
+        # parses each one once
+        conn = sqlite3.connect(DB_PATH, isolation_level=None, cached_statements=256)
         cursor = conn.cursor()
+        for pragma in BULK_LOAD_PRAGMAS:
+            cursor.execute(pragma)
+
+        # Create schema (a reused database already has it)
+        if not reuse_db:
+            for pragma in NEW_DB_PRAGMAS:
+                cursor.execute(pragma)
+            create_schema(cursor)
 
-        # Create schema and clear existing records
-        create_schema(cursor)
+        # Insert data into the database for all tables
+        # One explicit transaction for all three tables, so the load commits (and syncs) once
+        cursor.execute("BEGIN")
+
+        # Clear existing records in the same transaction, so a failed load keeps the old data
+        if reuse_db:
+            logger.info(f"Clearing existing records in: {DB_PATH}")
+            clear_tables(cursor)
 
         # Load prepared data using pandas
-        customers_df = pd.read_csv(CLEAN_DATA_DIR.joinpath("customers_prepared.csv"))
-        products_df = pd.read_csv(CLEAN_DATA_DIR.joinpath("products_prepared.csv"))
-        sales_df = pd.read_csv(CLEAN_DATA_DIR.joinpath("sales_prepared.csv"))
+        # Files are read on worker threads while this thread inserts (pyarrow and sqlite3
+        # release the GIL), so parsing overlaps with the inserts; all SQL stays on this thread
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            customers_future = executor.submit(
+                read_prepared, "customers_prepared.csv", CUSTOMER_DTYPES
+            )
+            products_future = executor.submit(
+                read_prepared, "products_prepared.csv", PRODUCT_DTYPES
+            )
 
-        # Insert data into the database for all tables
+            insert_customers(customers_future.result(), cursor)
 
-        insert_customers(customers_df, cursor)
+            insert_products(products_future.result(), cursor)
 
-        insert_products(products_df, cursor)
+            # Sales are the largest table, so they are streamed into the insert batch by batch
+            sales_batches = iter_prepared("sales_prepared.csv", SALE_DTYPES)
+            insert_sales(prefetch(sales_batches, executor), cursor)
 
-        insert_sales(sales_df, cursor)
+        cursor.execute("COMMIT")
 
-        conn.commit()
+        create_indexes(cursor)
         logger.info("ETL finished successfully. Data loaded into the warehouse.")
     finally:
         # Regardless of success or failure, close the DB connection if it exists
@@ -231,7 +231,7 @@ class DataScrubber:
             pd.DataFrame: Updated DataFrame with duplicates removed.
 
         """
-        self.df = self.df.drop_duplicates(subset=subset, keep='first')
+        self.df = self.df.drop_duplicates(subset=subset, keep=keep)
         return self.df
 
     def rename_columns(self, column_mapping: Dict[str, str]) -> pd.DataFrame:
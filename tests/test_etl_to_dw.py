@@ -0,0 +1,110 @@
+"""Test the load of the prepared files into the SQLite data warehouse.
+
+Module Information:
+    - Filename: test_etl_to_dw.py
+    - Module: test_etl_to_dw
+    - Location: tests/
+
+This test verifies that:
+    - A second load reuses the database and gives the same rows
+    - An unreadable database file is rebuilt
+    - The sale_dollars view returns the prepared sale amounts
+"""
+
+from contextlib import closing
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from analytics_project import etl_to_dw
+
+CUSTOMERS_CSV = """customer_id,name,region,join_date,number_of_purchases,contact_preferences
+1000,Robert Gomez,West,2/25/2024,3,Text
+1001,John Silva,East,12/1/2020,4,
+"""
+
+PRODUCTS_CSV = """product_id,product_name,category,unit_price,stock_quantity,purchase_type
+2000,Electronics-Be,electronics,969.31,3,Online
+2001,Electronics-Be,clothing,,7,In Store
+"""
+
+SALES_CSV = """sales_id,sale_date,customer_id,product_id,store_id,campaign_id,sales_amount,number_of_items,city
+1,4/5/2025,1000,2000,402,0,2048.2,4,atlanta
+2,4/5/2025,1001,2001,403,1,321.87,5,philadelphia
+2,4/5/2025,1001,2001,403,1,999.99,5,philadelphia
+3,4/5/2025,1000,2001,403,3,0.1,1,chicago
+"""
+
+
+@pytest.fixture
+def warehouse(tmp_path, monkeypatch):
+    """Point the load at prepared files and a database under tmp_path."""
+    clean_dir = tmp_path / "prepared"
+    clean_dir.mkdir()
+    (clean_dir / "customers_prepared.csv").write_text(CUSTOMERS_CSV, encoding="utf-8")
+    (clean_dir / "products_prepared.csv").write_text(PRODUCTS_CSV, encoding="utf-8")
+    (clean_dir / "sales_prepared.csv").write_text(SALES_CSV, encoding="utf-8")
+
+    monkeypatch.setattr(etl_to_dw, "CLEAN_DATA_DIR", clean_dir)
+    monkeypatch.setattr(etl_to_dw, "WAREHOUSE_DIR", tmp_path / "warehouse")
+    monkeypatch.setattr(etl_to_dw, "DB_PATH", tmp_path / "warehouse" / "smart_sales.db")
+    return etl_to_dw.DB_PATH
+
+
+def _dump(db_path):
+    """Return every row of the warehouse tables."""
+    with closing(sqlite3.connect(db_path)) as conn:
+        return {
+            "customer": conn.execute("SELECT * FROM customer ORDER BY rowid").fetchall(),
+            "product": conn.execute("SELECT * FROM product ORDER BY rowid").fetchall(),
+            "sale": conn.execute("SELECT * FROM sale ORDER BY rowid").fetchall(),
+        }
+
+
+def test_reload_reuses_database(warehouse):
+    """Verify a second load keeps the database file and gives the same rows."""
+    etl_to_dw.load_data_to_db()
+    first_load = _dump(warehouse)
+    assert etl_to_dw.get_schema_version(warehouse) == etl_to_dw.SCHEMA_VERSION
+    # Duplicate sale ids are skipped and a blank price is stored as NULL
+    assert [row[0] for row in first_load["sale"]] == [1, 2, 3]
+    assert [row[3] for row in first_load["product"]] == [96931, None]
+
+    # A marker table only survives if the second load reuses the file
+    with closing(sqlite3.connect(warehouse)) as conn:
+        conn.execute("CREATE TABLE marker (id INTEGER)")
+
+    etl_to_dw.load_data_to_db()
+
+    assert _dump(warehouse) == first_load
+    with closing(sqlite3.connect(warehouse)) as conn:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'marker'").fetchone()
+
+
+def test_garbage_file_is_rebuilt(warehouse):
+    """Verify a file that is not a SQLite database is replaced by a fresh warehouse."""
+    etl_to_dw.load_data_to_db()
+    expected = _dump(warehouse)
+
+    warehouse.write_bytes(b"not a database" * 512)
+    assert etl_to_dw.get_schema_version(warehouse) == 0
+
+    etl_to_dw.load_data_to_db()
+
+    assert _dump(warehouse) == expected
+    assert etl_to_dw.get_schema_version(warehouse) == etl_to_dw.SCHEMA_VERSION
+
+
+def test_sale_dollars_matches_prepared_csv(warehouse):
+    """Verify the sale_dollars view returns the prepared amounts in dollars."""
+    etl_to_dw.load_data_to_db()
+
+    prepared = pd.read_csv(etl_to_dw.CLEAN_DATA_DIR / "sales_prepared.csv")
+    expected = prepared.drop_duplicates("sales_id")["sales_amount"].tolist()
+    with closing(sqlite3.connect(warehouse)) as conn:
+        amounts = conn.execute("SELECT sales_amount FROM sale_dollars ORDER BY sales_id").fetchall()
+        cents = conn.execute("SELECT sales_amount FROM sale ORDER BY sales_id").fetchall()
+
+    assert [amount for (amount,) in amounts] == pytest.approx(expected)
+    assert [amount for (amount,) in cents] == [204820, 32187, 10]
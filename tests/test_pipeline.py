@@ -0,0 +1,100 @@
+"""Test the shared data preparation pipeline.
+
+Module Information:
+    - Filename: test_pipeline.py
+    - Module: test_pipeline
+    - Location: tests/
+
+This test verifies that:
+    - Streaming a file in small batches gives the same CSV and Parquet output
+      as cleaning it in memory
+    - Blank ids reach the missing-value rules instead of failing the read
+"""
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from analytics_project.data_preparation import pipeline
+
+RAW_CSV = """TransactionID,SaleDate,CustomerID,StoreID,City,SaleAmount
+1,01/02/2024,1001,401,Denver,10.5
+2,02/02/2024,1002,402,,?
+3,2024-03-02,,401,Austin,12.25
+2,02/02/2024,1002,402,Boston,11.0
+4,bad date,1003,403,denver,9.0
+,04/02/2024,1004,401,Denver,11.5
+5,05/02/2024,1001,,Austin,13.75
+6,06/02/2024,1002,402,Boston,500
+7,07/02/2024,1003,401,Denver,10.0
+"""
+
+CONFIG = pipeline.PipelineConfig(
+    name="test_pipeline",
+    input_file="sales.csv",
+    output_file="sales_prepared.csv",
+    id_column="sales_id",
+    dtypes={
+        "TransactionID": "Int32",
+        "CustomerID": "Int32",
+        "StoreID": "category",
+        "City": "category",
+    },
+    rename={
+        "TransactionID": "sales_id",
+        "SaleDate": "sale_date",
+        "CustomerID": "customer_id",
+        "StoreID": "store_id",
+        "City": "city",
+        "SaleAmount": "sales_amount",
+    },
+    numeric_columns=("sales_amount",),
+    required_columns=("sales_id",),
+    fill={"sale_date": "01/01/2024", "customer_id": 0, "store_id": 400, "city": "unknown city"},
+    median_fill_columns=("sales_amount",),
+    iqr_columns=("sales_amount",),
+    date_columns={"sale_date": ("%d/%m/%Y", "%Y-%d-%m")},
+    fill_unparsed_dates=True,
+    lower_columns=("city",),
+    round2_columns=("sales_amount",),
+)
+
+
+def _write_raw_csv(tmp_path, monkeypatch):
+    """Point the pipeline at tmp_path and write the raw CSV there."""
+    monkeypatch.setattr(pipeline, "RAW_DATA_DIR", tmp_path / "raw")
+    monkeypatch.setattr(pipeline, "PREPARED_DATA_DIR", tmp_path / "prepared")
+    (tmp_path / "raw").mkdir()
+    (tmp_path / "raw" / CONFIG.input_file).write_text(RAW_CSV, encoding="utf-8")
+
+
+def test_blank_ids_are_dropped_or_filled(tmp_path, monkeypatch):
+    """Verify a blank sales id drops the row and a blank customer id gets the fill value."""
+    _write_raw_csv(tmp_path, monkeypatch)
+
+    pipeline.run_pipeline(CONFIG)
+
+    df = pd.read_csv(tmp_path / "prepared" / CONFIG.output_file)
+    # The row without a sales id (customer 1004) is dropped
+    assert df["sales_id"].notna().all()
+    assert 1004 not in df["customer_id"].tolist()
+    assert df.loc[df["sales_id"] == 3, "customer_id"].tolist() == [0]
+    assert pd.api.types.is_integer_dtype(df["customer_id"])
+
+
+def test_stream_pipeline_matches_run_pipeline(tmp_path, monkeypatch):
+    """Verify the streamed output matches the in-memory output."""
+    _write_raw_csv(tmp_path, monkeypatch)
+    csv_path = tmp_path / "prepared" / CONFIG.output_file
+    parquet_path = csv_path.with_suffix(".parquet")
+
+    pipeline.run_pipeline(CONFIG)
+    expected_csv = csv_path.read_text(encoding="utf-8")
+    expected_table = pq.read_table(parquet_path)
+
+    # A tiny block size splits the file into several batches (the duplicate id spans two)
+    pipeline.stream_pipeline(CONFIG, block_size=96)
+
+    assert csv_path.read_text(encoding="utf-8") == expected_csv
+    streamed_table = pq.read_table(parquet_path)
+    assert streamed_table.schema.remove_metadata() == expected_table.schema.remove_metadata()
+    assert streamed_table.equals(expected_table)